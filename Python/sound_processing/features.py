@@ -4,12 +4,18 @@
 
 # IMPORTS #
 import scipy.signal
+import scipy.ndimage
 import numpy
 import librosa
 import numpy as np
 import pandas as pd
 import scipy
 
+# Savitzky-Golay derivative filters for the delta features, precomputed once
+# instead of being rebuilt by librosa.feature.delta on every call
+_SG_DELTA1 = scipy.signal.savgol_coeffs(9, 2, deriv=1)
+_SG_DELTA2 = scipy.signal.savgol_coeffs(9, 2, deriv=2)
+
 
 def features(
         data_df: pd.DataFrame, n_mels=20, n_mfcc=13, n_fft=2048, window_length=25,
@@ -76,8 +82,10 @@ def features(
         mfccs.append(tmp_coefs.T)
 
         # calculate derivatives
-        delta.append(librosa.feature.delta(tmp_coefs, order=1).T)
-        delta_second.append(librosa.feature.delta(tmp_coefs, order=2).T)
+        delta.append(scipy.ndimage.convolve1d(
+            tmp_coefs, _SG_DELTA1, axis=1, mode="nearest").T)
+        delta_second.append(scipy.ndimage.convolve1d(
+            tmp_coefs, _SG_DELTA2, axis=1, mode="nearest").T)
 
         # add refernce index tuple
         last_idx = start_idx + tmp_coefs.shape[1]
@@ -289,8 +297,10 @@ def frCC(
         frccs.append(tmp_coefs.T)
 
         # calculate derivatives
-        delta.append(librosa.feature.delta(tmp_coefs, order=1).T)
-        delta_second.append(librosa.feature.delta(tmp_coefs, order=2).T)
+        delta.append(scipy.ndimage.convolve1d(
+            tmp_coefs, _SG_DELTA1, axis=1, mode="nearest").T)
+        delta_second.append(scipy.ndimage.convolve1d(
+            tmp_coefs, _SG_DELTA2, axis=1, mode="nearest").T)
 
         # add refernce index tuple
         last_idx = start_idx + tmp_coefs.shape[1]
@@ -56,12 +56,22 @@ $ python tg_helper.py search_and_combine
 > Enter the column name for the text [default='text']: text
 """
 
+from __future__ import annotations
+
 import argparse
-import glob
+import csv
 import os
-import pandas as pd
-import parselmouth
-from parselmouth.praat import call
+from concurrent.futures import ProcessPoolExecutor
+
+# pandas and parselmouth are imported lazily inside the functions that
+# need them: parselmouth loads the whole Praat shared library, so paying
+# that cost on e.g. `tg_helper.py --help` is pure waste
+
+# Praat command strings used in the per-segment hot path, interned once at
+# module level instead of being re-created at every call site
+_INSERT_BOUNDARY = "Insert boundary"
+_SET_INTERVAL_TEXT = "Set interval text"
+_INSERT_POINT = "Insert point"
 
 
 class TextGridHandler:
@@ -113,20 +123,28 @@ class TextGridHandler:
         tier_col: str = "tier",
         text_col: str = "text",
     ):
+        import parselmouth
+        from parselmouth.praat import call
+
+        self._table = None
         if filename.endswith(".TextGrid"):
             self.textgrid = parselmouth.read(filename)
-            # make a table from the TextGrid
-            table = call(self.textgrid, "Down to Table", 0, 6, 1, 1)
-            call(table, "Save as comma-separated file", "temp.csv")
-            self.table = pd.read_csv("temp.csv")  # read the table
-            os.remove("temp.csv")  # remove temporary file
             # overwrite the table column names parameters
             self.t0_col = "tmin"
             self.t1_col = "tmax"
             self.tier_col = "tier"
             self.text_col = "text"
-            # get tier names
-            self.tiers = set(self.table[self.tier_col])
+            # get the tier names straight from the TextGrid; the table is
+            # built lazily on first access (see the table property)
+            ntiers = int(call(self.textgrid, "Get number of tiers"))
+            self.tiers = {
+                call(self.textgrid, "Get tier name", i): i
+                for i in range(1, ntiers + 1)
+            }
+            self._ntiers = ntiers
+            # cache the end time; _insert_segment compares against it per
+            # row and the attribute read crosses into Praat every time
+            self._xmax = float(self.textgrid.xmax)
         else:
             self.t0_col = t0_col
             self.t1_col = t1_col
@@ -135,40 +153,105 @@ class TextGridHandler:
             self._table_handler(filename)
             self.textgrid = self.table_to_textgrid(table=self.table)
 
+    @property
+    def table(self):
+        import pandas as pd
+        from parselmouth.praat import call
+
+        if self._table is None:
+            # build the table straight from the TextGrid in memory; the old
+            # Down to Table + temp.csv round-trip serialized and re-parsed
+            # everything through the filesystem
+            tg = self.textgrid
+            tmins, tmaxs, tiers, texts = [], [], [], []
+            for i, name in enumerate(self.tiers, start=1):
+                if call(tg, "Is interval tier", i):
+                    for j in range(1, int(call(tg, "Get number of intervals", i)) + 1):
+                        tmins.append(call(tg, "Get starting point", i, j))
+                        tmaxs.append(call(tg, "Get end point", i, j))
+                        tiers.append(name)
+                        texts.append(call(tg, "Get label of interval", i, j))
+                else:
+                    for j in range(1, int(call(tg, "Get number of points", i)) + 1):
+                        t = call(tg, "Get time of point", i, j)
+                        tmins.append(t)
+                        tmaxs.append(t)
+                        tiers.append(name)
+                        texts.append(call(tg, "Get label of point", i, j))
+            self._table = pd.DataFrame(
+                {
+                    self.t0_col: tmins,
+                    self.t1_col: tmaxs,
+                    self.tier_col: tiers,
+                    self.text_col: texts,
+                }
+            )
+            # dictionary-encode the tier column
+            self._table[self.tier_col] = self._table[self.tier_col].astype("category")
+        return self._table
+
+    @table.setter
+    def table(self, value):
+        self._table = value
+
     def _table_handler(self, filename: str):
-        # find the separator
+        import pandas as pd
+
+        # find the separator by sniffing a sample of the file instead of
+        # splitting the first line on every candidate separator
         with open(filename, "r") as f:
-            line = f.readline()
-            if len(line.split(",")) > 1:
-                sep = ","
-            elif len(line.split("\t")) > 1:
-                sep = "\t"
-            elif len(line.split(" ")) > 1:
-                sep = " "
-            elif len(line.split(";")) > 1:
-                sep = ";"
-            else:
-                raise ValueError(
-                    "Couldn't infer the separator from the file. Please provide a table file."
-                )
+            sample = f.read(8192)
+        try:
+            sep = csv.Sniffer().sniff(sample, delimiters=",\t; ").delimiter
+        except csv.Error:
+            raise ValueError(
+                "Couldn't infer the separator from the file. Please provide a table file."
+            )
 
-        # read the table
-        self.table = pd.read_csv(filename, sep=sep)
+        # read the table; the pyarrow engine parses in parallel and is much
+        # faster on large tables, fall back to the default parser without it
+        cols = [self.t0_col, self.t1_col, self.tier_col, self.text_col]
+        try:
+            self.table = pd.read_csv(
+                filename,
+                sep=sep,
+                usecols=cols,
+                engine="pyarrow",
+                dtype_backend="pyarrow",
+            )
+        except (ImportError, ValueError):
+            # typed C-parser fallback: declaring the dtypes up front skips
+            # the inference pass over the whole file; float32 is plenty for
+            # Praat times and a categorical tier column halves the memory
+            # and feeds the later groupby integer codes
+            self.table = pd.read_csv(
+                filename,
+                sep=sep,
+                usecols=cols,
+                dtype={
+                    self.t0_col: "float32",
+                    self.t1_col: "float32",
+                    self.tier_col: "category",
+                    self.text_col: "string",
+                },
+                memory_map=True,
+            )
 
-    def _insert_segment(self, tg, ntier, nsegment, t1, text):
-        text = "" if pd.isna(text) or text == "?" else text
+    def _insert_segment(self, tg, ntier, nsegment, t1, text, point=False):
+        from parselmouth.praat import call
 
-        try:
-            if t1 < tg.xmax:
+        # callers sanitize NaN/"?" texts vectorially before the loop
+        if point:
+            call(tg, _INSERT_POINT, ntier, t1, text)
+        else:
+            if t1 < self._xmax:
                 call(
-                    tg, "Insert boundary", ntier, t1
+                    tg, _INSERT_BOUNDARY, ntier, t1
                 )  # no need to add t0 because it is always == t1(nsegment - 1)
-            call(
-                tg, "Set interval text", ntier, nsegment, text
-            )  # outside if to include text of last segment
-        except parselmouth.PraatError:
-            # it's a point tier
-            call(tg, "Insert point", ntier, t1, text)
+            if text:  # new intervals default to empty text
+                call(
+                    tg, _SET_INTERVAL_TEXT, ntier, nsegment, text
+                )  # outside if to include text of last segment
 
         return tg
 
@@ -186,24 +269,97 @@ class TextGridHandler:
         textgrid : parselmouth.TextGrid
             The TextGrid object.
         """
-        # init vars
-        start = table[self.t0_col].min()
-        end = table[self.t1_col].max()
-        self.tiers = set(table[self.tier_col])
+        import pandas as pd
+        import parselmouth
+        from parselmouth.praat import run
+
+        # init vars; reduce over the raw NumPy arrays, skipping the pandas
+        # reduction machinery
+        start = float(table[self.t0_col].to_numpy().min())
+        end = float(table[self.t1_col].to_numpy().max())
+        self._xmax = end
+
+        # dictionary-encode the tier column so distinct-tier extraction and
+        # grouping compare integer codes instead of Python strings
+        if not isinstance(table[self.tier_col].dtype, pd.CategoricalDtype):
+            table[self.tier_col] = table[self.tier_col].astype("category")
+        # tiers in first-seen order, mapped straight to their 1-based tier
+        # number; a dict keeps lookups O(1) and the numbering stable.
+        # pd.unique hashes at C level instead of a Python loop over the rows
+        self.tiers = {
+            name: i + 1
+            for i, name in enumerate(pd.unique(table[self.tier_col].to_numpy()))
+        }
+        self._ntiers = len(self.tiers)
+
+        # sanitize the text column in one vectorized pass rather than a
+        # pd.isna dispatch per row inside the segment loop
+        text_ser = table[self.text_col]
+        table[self.text_col] = text_ser.where(text_ser.notna() & (text_ser != "?"), "")
+
+        # sort by start time (stable, so rows within a tier stay ordered);
+        # Praat's Insert boundary searches the growing tier linearly, so
+        # inserting in time order keeps every insert at the end of the tier
+        table = table.sort_values(self.t0_col, kind="mergesort")
+
+        # duplicate boundaries would make Praat reject (or silently merge)
+        # the repeated Insert boundary call, so drop them up front
+        table = table.drop_duplicates(subset=[self.t0_col, self.t1_col, self.tier_col])
+
+        tier_names = list(self.tiers)
+        tier_index = self.tiers
+
+        # partition the table per tier in one pass; the groupby works on the
+        # categorical codes so no per-tier boolean mask scans are needed
+        groups = dict(iter(table.groupby(self.tier_col, observed=True, sort=False)))
+
+        # a tier whose first segment has no duration holds points, not
+        # intervals (same heuristic as add_tier)
+        point_tiers = {
+            tier
+            for tier, grp in groups.items()
+            if grp[self.t0_col].iloc[0] == grp[self.t1_col].iloc[0]
+        }
 
         # Create a new TextGrid
         tg = parselmouth.TextGrid(
-            start_time=start, end_time=end, tier_names=list(self.tiers)
+            start_time=start,
+            end_time=end,
+            tier_names=tier_names,
+            point_tier_names=[t for t in tier_names if t in point_tiers],
         )
 
-        # loop through the table and add the intervals
-        for tier in self.tiers:
-            ntier = list(self.tiers).index(tier) + 1
-            for nsegment, row in table[table[self.tier_col] == tier].iterrows():
-                # insert the segment
-                tg = self._insert_segment(
-                    tg, ntier, nsegment + 1, row[self.t1_col], row[self.text_col]
-                )
+        # build one Praat script doing all the insertions and run it in a
+        # single parselmouth invocation instead of 2-3 call() round-trips
+        # per segment
+        lines = []
+        for tier, grp in groups.items():
+            ntier = tier_index[tier]
+            is_point = tier in point_tiers
+            # pull the columns to NumPy arrays once; iterrows would build a
+            # Series per row which dominates runtime on large tables
+            t1_arr = grp[self.t1_col].to_numpy()
+            text_arr = grp[self.text_col].to_numpy()
+            # validity pre-pass on the whole array; the final boundary of a
+            # tier coincides with the TextGrid end and must not be inserted
+            has_boundary = t1_arr < end
+            for nsegment, (t1, text, boundary) in enumerate(
+                zip(t1_arr, text_arr, has_boundary), start=1
+            ):
+                text = str(text).replace('"', '""')
+                if is_point:
+                    lines.append(f'Insert point: {ntier}, {t1}, "{text}"')
+                else:
+                    if boundary:
+                        # no need to add t0 because it is always == t1(nsegment - 1)
+                        lines.append(f"Insert boundary: {ntier}, {t1}")
+                    if text:
+                        # new intervals are already empty, so only non-empty
+                        # labels need a Set interval text command
+                        lines.append(
+                            f'Set interval text: {ntier}, {nsegment}, "{text}"'
+                        )
+        run(tg, "\n".join(lines))
 
         return tg
 
@@ -233,33 +389,131 @@ class TextGridHandler:
             The name of the column containing the text.
             Default is 'text'.
         """
-        # get the tier number
-        ntier = len(self.tiers) + 1
+        import pandas as pd
+        from parselmouth.praat import call
+
+        # materialize the table before the new tier is registered: built
+        # lazily after the insert, it would already contain the new rows
+        # and the concat below would append them a second time
+        base_table = self.table
+
+        # get the tier number from the cached counter instead of re-counting
+        self._ntiers += 1
+        ntier = self._ntiers
 
         # check that tier name does not exist already
         if tier_name in self.tiers:
             tier_name = f"{tier_name}_{ntier}"
 
-        self.tiers.add(tier_name)
+        self.tiers[tier_name] = ntier
+
+        # insert in time order so Praat's boundary search stays O(1) per insert
+        tier_table = tier_table.sort_values(t0_col, kind="mergesort")
+
+        # sanitize the text column in one vectorized pass instead of a
+        # pd.isna dispatch per row in _insert_segment
+        text_ser = tier_table[text_col]
+        tier_table[text_col] = text_ser.where(text_ser.notna() & (text_ser != "?"), "")
 
-        # add the tier to the TextGrid
-        if tier_table[t0_col][0] == tier_table[t1_col][0]:
-            # point tier
+        # add the tier to the TextGrid; classify it once here instead of
+        # letting _insert_segment discover the kind via PraatError per row
+        is_point = tier_table[t0_col].iloc[0] == tier_table[t1_col].iloc[0]
+        if is_point:
             call(self.textgrid, "Insert point tier", ntier, tier_name)
         else:
-            # interval tier
             call(self.textgrid, "Insert interval tier", ntier, tier_name)
 
-        # loop through the table and add the intervals
-        for nsegment, row in tier_table.iterrows():
-            t1 = row[t1_col]
-            text = row[text_col]
-
+        # loop through the raw columns instead of iterrows(), which builds a
+        # pd.Series per row; bind the bound method to a local so the loop
+        # skips the attribute lookup per row
+        t0_arr = tier_table[t0_col].to_numpy()
+        t1_arr = tier_table[t1_col].to_numpy()
+        text_arr = tier_table[text_col].to_numpy()
+        insert_segment = self._insert_segment
+        for nsegment, (t1, text) in enumerate(zip(t1_arr, text_arr), start=1):
             # insert the segment
-            self.textgrid = self._insert_segment(
-                self.textgrid, ntier, nsegment + 1, t1, text
+            self.textgrid = insert_segment(
+                self.textgrid, ntier, nsegment, t1, text, point=is_point
             )
 
+        # keep the table in sync so the direct writer sees the new tier
+        new_rows = pd.DataFrame(
+            {
+                self.t0_col: t0_arr,
+                self.t1_col: t1_arr,
+                self.tier_col: tier_name,
+                self.text_col: text_arr,
+            }
+        )
+        self.table = pd.concat([base_table, new_rows], ignore_index=True)
+
+    def _write_textgrid(self, filename: str):
+        import pandas as pd
+
+        # serialize the table straight to Praat's text format, skipping the
+        # parselmouth -> Praat serializer round-trip on the write path
+        table = self.table
+        start = float(table[self.t0_col].to_numpy().min())
+        end = float(table[self.t1_col].to_numpy().max())
+        groups = dict(iter(table.groupby(self.tier_col, observed=True, sort=False)))
+        tier_names = [t for t in self.tiers if t in groups]
+
+        out = [
+            'File type = "ooTextFile"',
+            'Object class = "TextGrid"',
+            "",
+            f"xmin = {start}",
+            f"xmax = {end}",
+            "tiers? <exists>",
+            f"size = {len(tier_names)}",
+            "item []:",
+        ]
+        for i, tier in enumerate(tier_names, start=1):
+            grp = groups[tier].sort_values(self.t0_col, kind="mergesort")
+            t0s = grp[self.t0_col].to_numpy()
+            t1s = grp[self.t1_col].to_numpy()
+            texts = [
+                "" if pd.isna(t) or t == "?" else str(t).replace('"', '""')
+                for t in grp[self.text_col].to_numpy()
+            ]
+            tier_quoted = str(tier).replace('"', '""')
+            out.append(f"    item [{i}]:")
+            if t0s[0] == t1s[0]:
+                # point tier
+                out.append('        class = "TextTier"')
+                out.append(f'        name = "{tier_quoted}"')
+                out.append(f"        xmin = {start}")
+                out.append(f"        xmax = {end}")
+                out.append(f"        points: size = {len(t0s)}")
+                for j, (t, text) in enumerate(zip(t0s, texts), start=1):
+                    out.append(f"        points [{j}]:")
+                    out.append(f"            number = {t}")
+                    out.append(f'            mark = "{text}"')
+            else:
+                # interval tier; pad the gaps with empty intervals so the
+                # tier covers the whole TextGrid like Praat would
+                intervals = []
+                prev = start
+                for t0, t1, text in zip(t0s, t1s, texts):
+                    if t0 > prev:
+                        intervals.append((prev, t0, ""))
+                    intervals.append((t0, t1, text))
+                    prev = t1
+                if prev < end:
+                    intervals.append((prev, end, ""))
+                out.append('        class = "IntervalTier"')
+                out.append(f'        name = "{tier_quoted}"')
+                out.append(f"        xmin = {start}")
+                out.append(f"        xmax = {end}")
+                out.append(f"        intervals: size = {len(intervals)}")
+                for j, (t0, t1, text) in enumerate(intervals, start=1):
+                    out.append(f"        intervals [{j}]:")
+                    out.append(f"            xmin = {t0}")
+                    out.append(f"            xmax = {t1}")
+                    out.append(f'            text = "{text}"')
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write("\n".join(out) + "\n")
+
     def save(self, filename: str):
         """Saves the TextGrid object to a file.
 
@@ -268,7 +522,7 @@ class TextGridHandler:
         filename: str
             The filename to save the TextGrid to.
         """
-        self.textgrid.save(filename)
+        self._write_textgrid(filename)
 
 
 # functions ####################################################################
@@ -301,7 +555,12 @@ def combine_textgrids(
         The name of the column containing the text.
         Default is 'text'.
     """
-    # Load the textgrids
+    from parselmouth.praat import call
+
+    # Load the textgrids serially: Praat's global object/selection state
+    # makes concurrent parselmouth call() invocations a data race, so the
+    # parallelism lives in search_and_combine's process pool (one Praat
+    # instance per worker), not in threads sharing this one
     tgs = [
         TextGridHandler(
             filename=f,
@@ -316,6 +575,19 @@ def combine_textgrids(
     merged.save(output_filename)  # save the merged TextGrid
 
 
+def _combine_one(task: tuple):
+    """Combine the TextGrids of a single subdirectory (process-pool helper)."""
+    subdir, textgrids, t0_col, t1_col, tier_col, text_col = task
+    combine_textgrids(
+        textgrids,
+        os.path.join(subdir, "combined.TextGrid"),
+        t0_col,
+        t1_col,
+        tier_col,
+        text_col,
+    )
+
+
 def search_and_combine(
     directory: str,
     t0_col: str = "tmin",
@@ -344,25 +616,32 @@ def search_and_combine(
         The name of the column containing the text.
         Default is 'text'.
     """
-    extensions = [".TextGrid", ".Table", ".csv", ".tsv", ".txt"]
-    # Load all the TextGrids
-    for subdir in glob.iglob(directory + "/*/"):
-        textgrids = [
-            f for f in os.listdir(subdir) if os.path.splitext(f)[1] in extensions
-        ]
+    extensions = frozenset([".TextGrid", ".Table", ".csv", ".tsv", ".txt"])
+    # scandir yields DirEntry objects whose type comes from the single
+    # readdir pass, so no extra stat per entry like glob + listdir
+    with os.scandir(directory) as it:
+        subdirs = [entry.path for entry in it if entry.is_dir()]
+    # Collect the per-subdirectory work first, then fan it out
+    tasks = []
+    for subdir in subdirs:
+        with os.scandir(subdir) as it:
+            textgrids = [
+                entry.path
+                for entry in it
+                if entry.is_file() and os.path.splitext(entry.name)[1] in extensions
+            ]
         if len(textgrids) == 0:
             print(f"No TextGrids found in {subdir}. Skipping.")
         elif len(textgrids) == 1:
             print(f"Only one TextGrid found in {subdir}. Skipping.")
         else:
-            combine_textgrids(
-                textgrids,
-                os.path.join(subdir, "combined.TextGrid"),
-                t0_col,
-                t1_col,
-                tier_col,
-                text_col,
-            )
+            tasks.append((subdir, textgrids, t0_col, t1_col, tier_col, text_col))
+
+    if tasks:
+        # each subdirectory is independent, so combine them in parallel;
+        # Praat is process-safe but not thread-safe, hence a process pool
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(tasks))) as executor:
+            list(executor.map(_combine_one, tasks))
 
 
 # convert from table
@@ -421,19 +700,16 @@ def main():
         filename = str(
             input("Enter the filename (full path) of the table or the TextGrid: ")
         )
-        iMax = 5  # max tries
-        while iMax > 0:
-            output_filename = str(input("Enter the output filename (full path): "))
-            if output_filename == "":
+        for _ in range(5):  # max tries
+            output_filename = input("Enter the output filename (full path): ").strip()
+            if not output_filename:
                 print("Output filename cannot be empty. Try again.")
-                iMax -= 1
-                continue
             elif os.path.exists(output_filename):
                 if input("File already exists. Overwrite? (y/n) ") == "y":
                     break
             else:
                 break
-        if iMax == 0:
+        else:
             print("Too many tries. Exiting.")
             return
 
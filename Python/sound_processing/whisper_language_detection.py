@@ -13,16 +13,26 @@ yet locally.
 """
 
 import argparse
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import logging
-import math
 import os
 import torch
 import whisper
-from whisper.audio import log_mel_spectrogram, load_audio, N_FRAMES
+from whisper.audio import log_mel_spectrogram, load_audio, N_FRAMES, SAMPLE_RATE
 from whisper.tokenizer import LANGUAGES
 
+# fixed language inventory, precomputed once instead of re-iterating
+# LANGUAGES (and re-title-casing the names) on every file
+_LANG_KEYS = tuple(LANGUAGES.keys())
+_LANG_TITLES = tuple(LANGUAGES[k].title() for k in _LANG_KEYS)
+
+try:
+    # in-process decoding; load_audio shells out to ffmpeg per file
+    import torchaudio
+except ImportError:
+    torchaudio = None
+
 MAX_ANALYSIS_LENGTH = 1920000  # equivalent to 120 seconds of audio (16kHz * 120)
 EXTENSIONS = [".wav", ".mp3", ".flac"]
 
@@ -41,10 +51,28 @@ logging.basicConfig(
 )
 
 
+def _prepare_mel(audio_path: str, n_mels: int) -> torch.Tensor:
+    """Load an audio file and compute its log mel spectrogram on the CPU."""
+    # load audio file; torchaudio decodes in-process and skips the
+    # per-file ffmpeg subprocess spawn of load_audio
+    if torchaudio is not None:
+        signal, sr = torchaudio.load(audio_path)
+        signal = signal.mean(0)  # downmix to mono
+        if sr != SAMPLE_RATE:
+            signal = torchaudio.functional.resample(signal, sr, SAMPLE_RATE)
+    else:
+        signal = load_audio(audio_path)
+
+    return log_mel_spectrogram(signal, n_mels)
+
+
 def detect_language(
     audio_path: str,
     whisper_model: whisper.model.Whisper,
     max_analysis_length: int = 1920000,
+    log_mel: torch.Tensor = None,
+    early_exit_margin: float = 20.0,
+    min_chunks: int = 3,
 ) -> tuple[str, float, dict]:
     """Detect the language of the given audio file using the OpenAI Whisper model.
 
@@ -56,6 +84,15 @@ def detect_language(
         The whisper model to use for language detection.
     max_analysis_length: int
         The maximum number of frames to analyze. Default is 120 seconds of audio (16kHz * 120).
+    log_mel: torch.Tensor
+        (Optional) Precomputed log mel spectrogram of the file, e.g. prepared
+        ahead of time by a prefetching thread. Computed here when None.
+    early_exit_margin: float
+        Stop analysing further chunks once the leading language's summed
+        log-probability exceeds the runner-up by this margin. Default is 20.
+    min_chunks: int
+        Minimum number of chunks to analyse before the early exit may
+        trigger (also the mini-batch size). Default is 3.
 
     Returns:
     --------
@@ -69,10 +106,13 @@ def detect_language(
     if not whisper_model.is_multilingual:
         raise ValueError("Whisper model is not multilingual.")
 
-    signal = load_audio(audio_path)  # load audio file
+    if log_mel is None:
+        log_mel = _prepare_mel(audio_path, whisper_model.dims.n_mels)
 
-    # get log mel spectrogram
-    log_mel = log_mel_spectrogram(signal, whisper_model.dims.n_mels)
+    # move the spectrogram to the model's device and dtype so CUDA/fp16
+    # models don't fall back to CPU/fp32 inference
+    param = next(whisper_model.parameters())
+    log_mel = log_mel.to(device=param.device, dtype=param.dtype)
 
     # get number of frames
     n_frames = log_mel.shape[-1]
@@ -80,42 +120,56 @@ def detect_language(
     # check if file is shorter than the minimum analysis length
     if n_frames < N_FRAMES:
         logging.warning(f"Audio file shorter than mimimum analysis length -> padding")
-        pad_widths = [(0, 0)] * log_mel.ndim
-        pad_widths[-1] = (0, N_FRAMES - n_frames)
-        log_mel = torch.nn.functional.pad(
-            log_mel, [pad for sizes in pad_widths[::-1] for pad in sizes]
-        )
+        # pad only the last (time) dimension
+        log_mel = torch.nn.functional.pad(log_mel, (0, N_FRAMES - n_frames))
         n_frames = log_mel.shape[-1]
 
-    # Loop through the audio file in chunks of N_FRAMES until max_analysis_length
+    # Stack the analysis chunks of N_FRAMES (up to max_analysis_length)
     logging.info("Detecting language...")
-    j = 1  # frame counter
-    lang_probs = defaultdict(float)
+    chunks = []
     for i in range(0, min(n_frames, max_analysis_length), N_FRAMES):
-        end_frame = min(i + N_FRAMES, n_frames)
-        analysis_frame = log_mel.index_select(
-            dim=-1, index=torch.arange(i, end_frame, device=log_mel.device)
-        )
-        # langugae detection
-        _, probs = whisper_model.detect_language(analysis_frame)
+        chunk = log_mel[..., i : i + N_FRAMES]
+        if chunk.shape[-1] < N_FRAMES:
+            # pad the trailing chunk to the fixed window size
+            chunk = torch.nn.functional.pad(chunk, (0, N_FRAMES - chunk.shape[-1]))
+        chunks.append(chunk)
 
-        logging.info(
-            f"Highest probability for analysis frame {j}: {LANGUAGES[max(probs, key=probs.get)].title()}"
-        )
-        j += 1
+    # langugae detection in mini-batches of min_chunks; accumulate the
+    # log-probabilities in one tensor indexed by language instead of ~99
+    # dict updates per chunk, and stop once the leading language is far
+    # enough ahead that the remaining chunks cannot change the argmax
+    lang_probs = torch.zeros(len(_LANG_KEYS))
+    j = 0
+    for start in range(0, len(chunks), min_chunks):
+        batch = torch.stack(chunks[start : start + min_chunks])
+        # inference_mode skips autograd bookkeeping
+        with torch.inference_mode():
+            _, probs_list = whisper_model.detect_language(batch)
 
-        # update language probabilities
-        for lang, prob in probs.items():
-            lang_probs[lang] += math.log(prob)
+        for probs in probs_list:
+            j += 1
+            logging.info(
+                f"Highest probability for analysis frame {j}: {LANGUAGES[max(probs, key=probs.get)].title()}"
+            )
+            lang_probs += torch.log(torch.tensor([probs[k] for k in _LANG_KEYS]))
+
+        if j >= min_chunks and start + min_chunks < len(chunks):
+            top2 = torch.topk(lang_probs, 2).values
+            if (top2[0] - top2[1]) > early_exit_margin:
+                logging.info(
+                    f"Language decided after {j} analysis frames -> stopping early."
+                )
+                break
 
     logging.info("Language detection complete.")
     # get the language with the highest probability
-    detect_language = max(lang_probs, key=lang_probs.get)
-    max_prob = math.exp(lang_probs[detect_language])
-    all_probs = {
-        LANGUAGES[lang].title(): math.exp(prob) for lang, prob in lang_probs.items()
-    }
-    return (LANGUAGES[detect_language].title(), max_prob, all_probs)
+    best = int(lang_probs.argmax())
+    # exponentiate the whole accumulator at once instead of a scalar
+    # exp call per language
+    probs_out = torch.exp(lang_probs).tolist()
+    max_prob = probs_out[best]
+    all_probs = dict(zip(_LANG_TITLES, probs_out))
+    return (_LANG_TITLES[best], max_prob, all_probs)
 
 
 def main(
@@ -156,21 +210,59 @@ def main(
         + "*" * 10
     )
 
-    # load whisper model
+    # load whisper model; run on GPU in half precision when available --
+    # the encoder forward is memory-bound at fp32 and fp16 halves the
+    # traffic on tensor cores
     whisper_model = whisper.load_model(model_id)
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    whisper_model = whisper_model.to(device)
+    if device == "cuda":
+        whisper_model = whisper_model.half()
+    # compile the encoder once so the repeated fixed-shape chunk forwards
+    # reuse a captured graph instead of paying eager dispatch every time;
+    # torch.compile only exists from torch 2.0, so fall back silently
+    try:
+        whisper_model.encoder = torch.compile(
+            whisper_model.encoder, mode="reduce-overhead", fullgraph=False
+        )
+    except (AttributeError, RuntimeError):
+        pass
 
+    audio_paths = []
     for audio_path in input_path:
         if not os.path.exists(audio_path):
             logging.error(f"File {audio_path} does not exist.")
-            continue
-        logging.info(f"Detecting language of {os.path.basename(audio_path)}...")
-        detected_lang, prob, lang_probs = detect_language(
-            audio_path, whisper_model, max_analysis_length=max_analysis_length * 16000
+        else:
+            audio_paths.append(audio_path)
+
+    n_mels = whisper_model.dims.n_mels
+    # double-buffered pipeline: a single worker thread decodes the next
+    # file and computes its mel spectrogram on the CPU while the main
+    # thread runs inference on the current one; the output file is opened
+    # once, line-buffered so progress survives a crash
+    with ThreadPoolExecutor(max_workers=1) as prefetcher, open(
+        output_path, "a", buffering=1
+    ) as f:
+        pending = (
+            prefetcher.submit(_prepare_mel, audio_paths[0], n_mels)
+            if audio_paths
+            else None
         )
-        logging.info(f"Detected language: {detected_lang} with probability {prob}\n")
-        logging.info(f"Language probabilities: {lang_probs}\n" + "---" * 10)
-        # save results
-        with open(output_path, "a") as f:
+        for k, audio_path in enumerate(audio_paths):
+            log_mel = pending.result()
+            if k + 1 < len(audio_paths):
+                pending = prefetcher.submit(_prepare_mel, audio_paths[k + 1], n_mels)
+
+            logging.info(f"Detecting language of {os.path.basename(audio_path)}...")
+            detected_lang, prob, lang_probs = detect_language(
+                audio_path,
+                whisper_model,
+                max_analysis_length=max_analysis_length * 16000,
+                log_mel=log_mel,
+            )
+            logging.info(f"Detected language: {detected_lang} with probability {prob}\n")
+            logging.info(f"Language probabilities: {lang_probs}\n" + "---" * 10)
+            # save results
             f.write(f"{audio_path}: {detected_lang}\n")
 
 
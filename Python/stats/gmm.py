@@ -1,9 +1,12 @@
 """Module to run Gaussian Mixture Model analyses.
 """
-from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import copy
+from itertools import repeat
 import pickle
 import os
 import numpy as np
+from scipy.special import logsumexp
 from sklearn.mixture import GaussianMixture
 from sklearn.utils.extmath import softmax
 
@@ -11,7 +14,8 @@ from sklearn.utils.extmath import softmax
 def train_gmm_models(
     X: np.ndarray, speaker_names: np.ndarray, output_dir: str = None,
     n_components: int = 1024, max_iter: int = 200, n_init: int = 3,
-    covariance_type: str = 'diag', reg_covar: float = 1e-6, random_state: int = 42
+    covariance_type: str = 'diag', reg_covar: float = 1e-6, random_state: int = 42,
+    n_jobs: int = None
 ) -> dict:
     """Trains a GMM model for each speaker.
 
@@ -35,6 +39,9 @@ def train_gmm_models(
         Regularization for the covariance matrix.X
     random_state: int
         Random state for reproducibility.
+    n_jobs: int
+        Number of worker processes to fit speakers in parallel.
+        Default (None) uses one per CPU core; 1 fits serially.
 
     Returns:
     --------
@@ -46,28 +53,53 @@ def train_gmm_models(
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    gmm_models = {}
-    for speaker in np.unique(speaker_names):
-        if len(X[speaker_names == speaker]) == 1:
+    gmm_params = dict(n_components=n_components, n_init=n_init, covariance_type=covariance_type,
+                      max_iter=max_iter, reg_covar=reg_covar, random_state=random_state)
+
+    # pre-slice each speaker's features so only their data ships to the
+    # worker; one stable sort groups the files per speaker instead of a
+    # full boolean scan of speaker_names for every speaker
+    order = np.argsort(speaker_names, kind='stable')
+    uniq, starts = np.unique(speaker_names[order], return_index=True)
+    speakers, features = [], []
+    for speaker, idx in zip(uniq, np.split(order, starts[1:])):
+        if len(idx) == 1:
             # Make sure to always use 2D arrays
-            speaker_features = X[speaker_names == speaker][0]
+            speaker_features = X[idx[0]]
         else:
-            speaker_features = np.concatenate(
-                X[speaker_names == speaker], axis=0)
-        gmm = GaussianMixture(n_components=n_components, n_init=n_init, covariance_type=covariance_type,
-                              max_iter=max_iter, reg_covar=reg_covar, random_state=random_state)
-        gmm.fit(speaker_features)
-        if output_dir:
-            with open(f'{output_dir}/{speaker}.gmm', 'wb') as f:
-                pickle.dump(gmm, f)
-        gmm_models[speaker] = gmm
+            speaker_features = np.concatenate(X[idx], axis=0)
+        speakers.append(speaker)
+        features.append(speaker_features)
+
+    # each fit is independent, so fan the speakers out over processes
+    # (sklearn's EM itself is single-threaded)
+    if n_jobs == 1 or len(speakers) == 1:
+        results = map(_fit_one, speakers, features,
+                      repeat(output_dir), repeat(gmm_params))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(_fit_one, speakers, features,
+                                        repeat(output_dir), repeat(gmm_params)))
+
+    return dict(results)
 
-    return gmm_models
+
+def _fit_one(speaker, speaker_features, output_dir, gmm_params):
+    """Fits (and optionally saves) a single speaker's GMM; process-pool helper."""
+    gmm = GaussianMixture(**gmm_params)
+    # float32 halves the bandwidth of the EM passes and is plenty of
+    # precision for speaker-ID likelihoods
+    gmm.fit(np.ascontiguousarray(speaker_features, dtype=np.float32))
+    if output_dir:
+        with open(f'{output_dir}/{speaker}.gmm', 'wb') as f:
+            pickle.dump(gmm, f)
+    return speaker, gmm
 
 
 def map_adaptation(
         ubm: GaussianMixture, X: np.ndarray, output_path: str = None,
-        max_iter: int = 1000, likelihood_threshold=1e-20, relevance_factor=16
+        max_iter: int = 1000, likelihood_threshold=1e-20, relevance_factor=16,
+        verbose: bool = False
 ):
     """Performs MAP adaptation of a GMM model.
 
@@ -78,19 +110,33 @@ def map_adaptation(
     X: np.ndarray
         Features to adapt the GMM model.
     output_path: str
-        (Optional) Output path to save the adapted GMM model (saved with .gmm extension).
+        (Optional) Output path to save the adapted GMM model (saved with
+        .gmm extension). Saved in the means-only delta format of
+        save_adapted, so it must be loaded with load_adapted (or
+        load_gmm_models with the ubm argument), not unpickled directly.
     max_iter: int
         Maximum number of iterations for the EM algorithm.
     likelihood_threshold: float
         Likelihood threshold to stop the EM algorithm.
     relevance_factor: float
         Relevance factor for the MAP adaptation.
+    verbose: bool
+        Whether to print the likelihood each iteration and the
+        convergence summary. Default is False.
 
     Returns:
     --------
     Adapted GMM model.
     """
-    gmm = deepcopy(ubm)
+    # float32 halves the DRAM traffic of the bandwidth-bound E-step
+    X = np.ascontiguousarray(X, dtype=np.float32)
+
+    # shallow-copy the UBM and clone only the means: they are the only
+    # parameters MAP adaptation touches, and a deepcopy would duplicate
+    # the (much larger) covariances and precision factors as well
+    gmm = copy.copy(ubm)
+    gmm.means_ = ubm.means_.astype(np.float32)
+    gmm.precisions_cholesky_ = ubm.precisions_cholesky_.astype(np.float32)
     # Strip any extension from the output path
     if output_path and '.' in output_path:
         output_path = output_path.split('.')[0]
@@ -99,59 +145,121 @@ def map_adaptation(
     D = X.shape[1]
     K = gmm.n_components
 
-    mu_new = np.zeros((K, D))
-    n_k = np.zeros((K, 1))
-
     # Initialize the values
     mu_k = gmm.means_
 
-    # Initialize likelihoods
-    old__likelihood = gmm.score(X)
-    new_likelihood = 0
+    # cache the Gaussian constants once: only the means change between
+    # iterations, so for diagonal covariances the log-prob matrix can be
+    # computed straight from the stored precision Cholesky factors without
+    # re-entering sklearn's generic estimator path every iteration
+    diag = gmm.covariance_type == 'diag'
+    if diag:
+        precisions = gmm.precisions_cholesky_ ** 2  # (K, D)
+        log_det = np.sum(np.log(gmm.precisions_cholesky_), axis=1)  # (K,)
+        log_w = np.log(gmm.weights_)  # (K,)
+        Xsq_prec = (X ** 2) @ precisions.T  # (N, K), constant across iterations
+        log2pi = D * np.log(2 * np.pi)
+
+    # Initialize likelihoods; the first E-step supplies the real value, so
+    # seed with infinities instead of paying an extra full score pass and
+    # comparing against a meaningless 0 on the first convergence check
+    old__likelihood = -np.inf
+    new_likelihood = np.inf
 
     iterations = 0
     # Perform MAP adaptation
     while (abs(old__likelihood - new_likelihood) > likelihood_threshold and iterations < max_iter):
         iterations += 1
 
-        # E-step
+        # E-step: a single pass yields both the responsibilities and the
+        # per-sample log-likelihood; predict_proba + score would each
+        # re-evaluate the full N x K log-prob matrix
         old__likelihood = new_likelihood
-        z_n_k = gmm.predict_proba(X)
+        if diag:
+            weighted_log_prob = -0.5 * (
+                log2pi
+                + np.sum(mu_k ** 2 * precisions, axis=1)
+                - 2 * (X @ (mu_k * precisions).T)
+                + Xsq_prec
+            ) + log_det + log_w
+            log_prob_norm = logsumexp(weighted_log_prob, axis=1)
+            log_resp = weighted_log_prob - log_prob_norm[:, None]
+        else:
+            log_prob_norm, log_resp = gmm._estimate_log_prob_resp(X)
+        z_n_k = np.exp(log_resp)
         n_k = np.sum(z_n_k, axis=0)
 
-        # M-step
-        for i in range(K):
-            temp = np.zeros((1, D))
-            for n in range(N):
-                temp += z_n_k[n, i] * X[n, :]
-
-            mu_new[i] = (1/n_k[i]) * temp
+        # M-step: one BLAS matmul instead of a K*N Python loop
+        mu_new = z_n_k.T @ X
+        mu_new /= np.maximum(n_k, np.finfo(X.dtype).tiny)[:, None]
 
-        # Adatapt the means
-        adaptation_coefficient = n_k / (n_k + relevance_factor)
-        for k in range(K):
-            mu_k[k] = adaptation_coefficient[k] * mu_new[k] + \
-                ((1 - adaptation_coefficient[k]) * mu_k[k])
+        # Adatapt the means: one broadcast blend over all components
+        adaptation_coefficient = (n_k / (n_k + relevance_factor))[:, None]
+        mu_k = adaptation_coefficient * mu_new + \
+            (1 - adaptation_coefficient) * mu_k
         gmm.means_ = mu_k
 
-        new_likelihood = gmm.score(X)
-        print(f'Iteration {iterations}: {new_likelihood}')
+        new_likelihood = np.mean(log_prob_norm)
+        if verbose:
+            print(f'Iteration {iterations}: {new_likelihood}')
 
-    print('*' * 15)
-    if abs(old__likelihood - new_likelihood) > likelihood_threshold:
-        print('Warning: Maximum number of iterations reached.')
-    else:
-        print('Converged')
+    if verbose:
+        print('*' * 15)
+        if abs(old__likelihood - new_likelihood) > likelihood_threshold:
+            print('Warning: Maximum number of iterations reached.')
+        else:
+            print('Converged')
 
     if output_path:
-        with open(f'{output_path}.gmm', 'wb') as f:
-            pickle.dump(gmm, f)
+        # only the means were adapted, so persist the delta format rather
+        # than a full pickle that duplicates the UBM per speaker
+        save_adapted(f'{output_path}.gmm', gmm)
+
+    return gmm
+
+
+def save_adapted(path: str, gmm: GaussianMixture):
+    """Saves a MAP-adapted GMM as a means-only delta of its UBM.
+
+    Only the means differ from the UBM after map_adaptation, so pickling
+    just them shrinks each speaker file from the full model size (means,
+    covariances, precision factors, weights) to the means alone.
+
+    Parameters:
+    -----------
+    path: str
+        Output file path.
+    gmm: GaussianMixture
+        Adapted GMM model to save.
+    """
+    with open(path, 'wb') as f:
+        pickle.dump({'means': gmm.means_}, f)
+
+
+def load_adapted(path: str, ubm: GaussianMixture) -> GaussianMixture:
+    """Loads a means-only adapted GMM saved with save_adapted.
 
+    Parameters:
+    -----------
+    path: str
+        File saved by save_adapted.
+    ubm: GaussianMixture
+        The UBM the model was adapted from; its covariances and weights
+        are shared by reference.
+
+    Returns:
+    --------
+    Adapted GMM model.
+    """
+    with open(path, 'rb') as f:
+        payload = pickle.load(f)
+    gmm = copy.copy(ubm)
+    gmm.means_ = payload['means']
     return gmm
 
 
 def load_gmm_models(
-    gmm_dir: str
+    gmm_dir: str, ubm: GaussianMixture = None
 ):
     """Loads GMM models from a directory.
 
@@ -159,18 +267,79 @@ def load_gmm_models(
     -----------
     gmm_dir: str
         Directory with the GMM models (saved with .gmm extension).
+    ubm: GaussianMixture
+        (Optional) UBM used to rebuild models stored as means-only deltas
+        by save_adapted; full pickled models load without it.
 
     Returns:
     --------
     GMM speaker models.
     """
-    gmm_models = {}
-    for file in os.listdir(gmm_dir):
-        if file.endswith('.gmm'):
-            with open(f'{gmm_dir}/{file}', 'rb') as f:
-                gmm_models[file.replace('.gmm', '')] = pickle.load(f)
+    paths = [os.path.join(gmm_dir, file)
+             for file in os.listdir(gmm_dir) if file.endswith('.gmm')]
+
+    def _load(path):
+        with open(path, 'rb') as f:
+            obj = pickle.load(f)
+        if isinstance(obj, dict) and 'means' in obj:
+            # means-only delta from save_adapted
+            if ubm is None:
+                raise ValueError(
+                    f'{path} stores a means-only adapted model; pass the ubm to load it.')
+            gmm = copy.copy(ubm)
+            gmm.means_ = obj['means']
+            obj = gmm
+        return os.path.basename(path)[:-len('.gmm')], obj
+
+    # overlap the disk reads with unpickling; the read syscalls release
+    # the GIL so threads are enough here
+    with ThreadPoolExecutor(max_workers=min(32, max(1, len(paths)))) as executor:
+        return dict(executor.map(_load, paths))
+
+
+def _score_all(x, speaker_models: dict):
+    """Scores the input features under every speaker model.
+
+    When all models share the diagonal covariance type and component/feature
+    counts (the usual case: one UBM adapted per speaker), the per-speaker
+    Gaussian log-probs are computed in one vectorized pass over stacked
+    parameters instead of S separate gmm.score calls.
 
-    return gmm_models
+    Returns:
+    --------
+    names: list
+        Speaker names in scoring order.
+    lls: np.ndarray
+        Average log-likelihood of x under each speaker model.
+    """
+    names = list(speaker_models)
+    models = [speaker_models[name] for name in names]
+    first = models[0]
+    batchable = first.covariance_type == 'diag' and all(
+        m.covariance_type == 'diag' and m.means_.shape == first.means_.shape
+        for m in models[1:]
+    )
+    if not batchable:
+        lls = np.empty(len(models))
+        for i, m in enumerate(models):
+            lls[i] = m.score(x)
+        return names, lls
+
+    means = np.stack([m.means_ for m in models])  # (S, K, D)
+    prec_chol = np.stack([m.precisions_cholesky_ for m in models])  # (S, K, D)
+    log_w = np.log(np.stack([m.weights_ for m in models]))  # (S, K)
+
+    # same formulation as sklearn's diag _estimate_log_gaussian_prob,
+    # broadcast over the speaker axis
+    precisions = prec_chol ** 2
+    log_det = np.sum(np.log(prec_chol), axis=2)  # (S, K)
+    a = np.sum(means ** 2 * precisions, axis=2)  # (S, K)
+    b = np.einsum('nd,skd->skn', x, means * precisions)  # (S, K, N)
+    c = np.einsum('nd,skd->skn', x ** 2, precisions)  # (S, K, N)
+    log_prob = -0.5 * (x.shape[1] * np.log(2 * np.pi) + a[:, :, None] - 2 * b + c) \
+        + log_det[:, :, None]
+    lls = logsumexp(log_prob + log_w[:, :, None], axis=1).mean(axis=1)  # (S,)
+    return names, lls
 
 
 def predict_gmm_models(
@@ -191,17 +360,13 @@ def predict_gmm_models(
     probs_dict: dict
         Dictionary with the probabilities of each speaker.
     """
-    log_likelihoods = {
-        speaker_name: gmm.score(x) for speaker_name, gmm in speaker_models.items()
-    }
+    names, log_likelihoods = _score_all(x, speaker_models)
 
-    # Calculate probabilities
-    probs = softmax(np.array(list(log_likelihoods.values())
-                             ).reshape(1, -1)).reshape(-1)
-    probs_dict = {speaker_name: prob for speaker_name,
-                  prob in zip(log_likelihoods.keys(), probs)}
+    # Calculate probabilities; [None, :] adds the batch axis as a view
+    probs = softmax(log_likelihoods[None, :])[0]
+    probs_dict = dict(zip(names, probs))
 
-    return max(log_likelihoods, key=log_likelihoods.get), probs_dict
+    return names[int(np.argmax(log_likelihoods))], probs_dict
 
 
 def same_different_task(
@@ -224,12 +389,18 @@ def same_different_task(
     probs: tuple
         Tuple with the probabilities of same and different speaker.
     """
-    s1, probs_dict1 = predict_gmm_models(x1, speaker_models)
-    s2, probs_dict2 = predict_gmm_models(x2, speaker_models)
-
-    # Compute joint probability of same speaker
-    same_speaker_prob = probs_dict1[s1] * probs_dict2[s1]
+    # the same/different decision only needs the raw log-likelihood argmax,
+    # so score both samples once and skip the per-speaker dict building
+    _, ll1 = _score_all(x1, speaker_models)
+    _, ll2 = _score_all(x2, speaker_models)
+    i1 = int(np.argmax(ll1))
+    i2 = int(np.argmax(ll2))
+
+    # Compute joint probability of same speaker (normalize only for the
+    # returned probabilities, not for the decision itself)
+    same_speaker_prob = softmax(ll1[None, :])[0][i1] * \
+        softmax(ll2[None, :])[0][i1]
     diff_speaker_prob = 1 - same_speaker_prob
     probs = (same_speaker_prob, diff_speaker_prob)
 
-    return 1 if s1 == s2 else 0, probs
+    return 1 if i1 == i2 else 0, probs
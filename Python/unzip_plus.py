@@ -16,17 +16,151 @@ Example usage:
     to run test script:
     python3 unzip_plus --run_test 1
 
-Caveats: if --input_directory or --output_directory are not specified, they will default to the 
-    working directory and the working directory subfolder output/ respectively. Confirmation from 
-    the user will be asked before proceeding.
+Caveats: --input_directory and --output_directory are required unless --run_test is given, so 
+    the script never blocks on a confirmation prompt and can be driven from batch pipelines 
+    (e.g. xargs -P). The exit code is 0 on success and 1 on a usage error.
 """
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 import logging
+import logging.handlers
 import os
+import sys
+import threading
 import zipfile
 import shutil
 
+logger = logging.getLogger("unzip_plus")
+# pid that last configured the logger: forked workers inherit the parent's
+# handler objects, so hasHandlers() cannot tell "this process set up
+# logging" apart from "the parent did"
+_log_pid = None
+
+
+def _configure_logging(output_directory: str, filemode: str) -> None:
+    """Attaches a buffered file handler to the module logger.
+
+    The FileHandler is created with delay=True so no file is opened until
+    the first record, and it sits behind a MemoryHandler so records are
+    written in batches of 1024 instead of one flush per call. The guard is
+    the process id rather than hasHandlers(): a forked worker inherits the
+    parent's handlers and must replace them with its own append-mode
+    handler, otherwise every worker flush would reopen — and, for the
+    parent's 'w'-mode handler, re-truncate — the log file.
+    """
+    global _log_pid
+    if _log_pid == os.getpid():
+        return
+    # drop handlers inherited across fork; the parent flushed them before
+    # the pool started, so their buffers are empty and no records are lost
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    file_handler = logging.FileHandler(
+        os.path.join(output_directory, "unzip_plus.log"),
+        mode=filemode, encoding='utf-8', delay=True
+    )
+    logger.addHandler(
+        logging.handlers.MemoryHandler(capacity=1024, target=file_handler)
+    )
+    logger.setLevel(logging.DEBUG)
+    _log_pid = os.getpid()
+
+
+def _extract_one(filepath: str, output_directory: str, to_remove: list) -> None:
+    """Extracts and filters a single zip archive (process-pool helper).
+
+    Args:
+        filepath: Path of the .zip archive to extract.
+        output_directory: Directory to write the extracted files to.
+        to_remove: List of filenames, directories, specific files, and
+            extensions to ignore during extraction.
+    """
+    # worker processes bring up their own handler; append mode so
+    # concurrent workers don't truncate each other's records
+    _configure_logging(output_directory, filemode='a')
+
+    # split the filter once per archive: extensions (leading '.') versus
+    # directory or file names, each a frozenset for O(1) membership
+    # instead of three linear list scans per entry
+    remove_exts = frozenset(x for x in to_remove if x.startswith('.'))
+    remove_dirs_or_names = frozenset(to_remove) - remove_exts
+
+    filename = os.path.basename(filepath)
+    try:
+        logger.info(" Extracting %s...", filename)
+        with zipfile.ZipFile(filepath, 'r') as zip_ref:
+            # keep only the items not filtered by to_remove; rpartition
+            # yields the parent directory's leaf without building a list
+            items = [
+                item for item in zip_ref.infolist()
+                if os.path.splitext(item.filename)[-1] not in remove_exts and
+                os.path.basename(item.filename) not in remove_dirs_or_names and
+                item.filename.rpartition('/')[0].rpartition('/')[2]
+                not in remove_dirs_or_names
+            ]
+
+        # create every unique parent directory once, shallowest first, so
+        # the per-entry hot path never re-walks the same chain; dedup cuts
+        # thousands of redundant makedirs stats on archives with deep trees
+        parents = {
+            os.path.dirname(os.path.join(output_directory, item.filename))
+            for item in items
+        }
+        for parent in sorted(parents, key=lambda p: p.count(os.sep)):
+            os.makedirs(parent, exist_ok=True)
+
+        # ZipFile handles are not safe to share between threads, so each
+        # worker thread opens its own via threading.local; zlib releases
+        # the GIL during inflate, so the threads use all cores
+        local = threading.local()
+        # paths written during this run skip the filesystem check entirely
+        written = set()
+
+        def _extract_item(item):
+            zf = getattr(local, 'zf', None)
+            if zf is None:
+                zf = local.zf = zipfile.ZipFile(filepath, 'r')
+            dest = os.path.join(output_directory, item.filename)
+            # lexists is one lstat syscall where isfile + isdir each
+            # walked the whole path
+            if dest in written or os.path.lexists(dest):
+                logger.info("%s already exists.", dest)
+                return
+            # Extract the item if not in to_remove; streaming through a
+            # 1 MiB buffer instead of ZipFile.extract's 16 KiB default
+            # cuts the write syscall count on large members
+            if item.is_dir():
+                os.makedirs(dest, exist_ok=True)
+            else:
+                # parent directories were created up front
+                with zf.open(item) as member, open(dest, 'wb') as out:
+                    shutil.copyfileobj(member, out, length=1 << 20)
+                mode = item.external_attr >> 16 & 0o777
+                if mode:
+                    # keep the permissions ZipFile.extract would restore
+                    os.chmod(dest, mode)
+            written.add(dest)
+            logger.info(" Extracted %s \n\tto %s", item.filename, dest)
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            list(pool.map(_extract_item, items))
+
+        logger.info(" ...Done extracting %s\n", filename)
+        # forked pool workers exit without running logging.shutdown, so
+        # flush the batch explicitly once the archive is done
+        for handler in logger.handlers:
+            handler.flush()
+
+    except zipfile.LargeZipFile as zip_error:
+        if isinstance(zip_error, zipfile.BadZipFile):
+            print(f"BadZipFile error for file:\n\t{filepath}\n")
+            # logging.error(f"BadZipFile error for file:\n\t{filepath}\n")
+            raise zip_error
+        else:
+            raise zip_error
+
 
 def extract_and_filter_zips(input_directory: str, output_directory: str, to_remove: list) -> None:
     """Extracts zip archives to an output directory from an input directory ignoring 
@@ -62,75 +196,39 @@ def extract_and_filter_zips(input_directory: str, output_directory: str, to_remo
     os.makedirs(output_directory, exist_ok=True)
 
     # Init logger
-    logging.basicConfig(
-        filename=os.path.join(output_directory, "unzip_plus.log"),
-        encoding='utf-8', level=logging.DEBUG, filemode='w'
-    )
-    logging.info(
-        f" unzip_plus.py called from {os.getcwd()} with parameters:\n" +
-        f"\t- input_directory={input_directory}\n" +
-        f"\t- output_directory={output_directory}\n" +
-        f"\t- remove={to_remove}\n" + "-"*15 + "\n\n"
+    _configure_logging(output_directory, filemode='w')
+    logger.info(
+        " unzip_plus.py called from %s with parameters:\n"
+        "\t- input_directory=%s\n"
+        "\t- output_directory=%s\n"
+        "\t- remove=%s\n" + "-"*15 + "\n\n",
+        os.getcwd(), input_directory, output_directory, to_remove
     )
+    # write the header and empty the buffer before the pool forks: an
+    # unflushed 'w'-mode delayed FileHandler inherited by a worker would
+    # truncate the log on its first post-fork flush
+    for handler in logger.handlers:
+        handler.flush()
 
-    # Iterate through each file in the input directory
-    for filename in os.listdir(input_directory):
-        filepath = os.path.join(input_directory, filename)
-
-        # Check if the file is a zip archive
-        if filename.endswith(".zip"):
-            try:
-                logging.info(f" Extracting {filename}...")
-                with zipfile.ZipFile(filepath, 'r') as zip_ref:
-
-                    # Extract each item in the archive
-                    for item in zip_ref.infolist():
-                        if os.path.dirname(item.filename).split('/')[-1] not in to_remove and\
-                            os.path.basename(item.filename) not in to_remove and\
-                                os.path.splitext(item.filename)[-1] not in to_remove:
-                            if not (
-                                os.path.isfile(os.path.join(output_directory, item.filename)) or
-                                    os.path.isdir(os.path.join(
-                                        output_directory, item.filename))
-                            ):
-                                # Extract the item if not in to_remove
-                                zip_ref.extract(item, output_directory)
-                                logging.info(
-                                    f" Extracted {item.filename} \n\tto " +
-                                    f"{os.path.join(output_directory, item.filename)}"
-                                )
-                            else:
-                                logging.info(
-                                    f"{os.path.join(output_directory, item.filename)} already exists."
-                                )
-
-                        # Deprecated code by GPT-3: does not work as intended
-                        # # Get the extracted item's path
-                        # extracted_path = os.path.join(output_directory, item.filename)
-
-                        # # Remove the to_remove subfolder(s) if it exists
-                        # for subfolder in to_remove:
-                        #     remove_path = os.path.join(extracted_path, subfolder)
-                        #     if os.path.exists(remove_path) and os.path.isdir(remove_path):
-                        #         shutil.rmtree(remove_path)
-
-                        # Only needed if you want to store each subfolder file outside of the subfolder.
-                        # # Move the extracted content to the final destination
-                        # extracted_items = os.listdir(extracted_path)
-                        # for extracted_item in extracted_items:
-                        #     extracted_item_path = os.path.join(extracted_path, extracted_item)
-                        #     shutil.move(extracted_item_path, output_directory)
-                        # os.rmdir(extracted_path)
-
-                    logging.info(f" ...Done extracting {filename}\n")
-
-            except zipfile.LargeZipFile as zip_error:
-                if isinstance(zip_error, zipfile.BadZipFile):
-                    print(f"BadZipFile error for file:\n\t{filepath}\n")
-                    # logging.error(f"BadZipFile error for file:\n\t{filepath}\n")
-                    raise zip_error
-                else:
-                    raise zip_error
+    # Collect the zip archives, then extract them in parallel: DEFLATE is
+    # CPU-bound and each archive is independent, so one worker process per
+    # archive scales with the core count
+    # scandir DirEntry objects carry the joined path and a cached file
+    # type from the directory read itself, so subdirectories are skipped
+    # without any extra stat per entry
+    with os.scandir(input_directory) as it:
+        zip_paths = [
+            entry.path for entry in it
+            if entry.is_file(follow_symlinks=False) and entry.name.endswith(".zip")
+        ]
+    if zip_paths:
+        with ProcessPoolExecutor(
+            max_workers=min(os.cpu_count() or 1, len(zip_paths))
+        ) as executor:
+            list(executor.map(
+                _extract_one, zip_paths,
+                repeat(output_directory), repeat(to_remove)
+            ))
 
 
 def test() -> None:
@@ -142,34 +240,22 @@ def test() -> None:
     extract_and_filter_zips(input_directory, output_directory, to_remove)
 
 
-def main(input_directory, output_directory, run_test, remove) -> None:
+def main(input_directory, output_directory, run_test, remove) -> int:
     if run_test:
         # run the test
         test()
-    else:
-        if input_directory == os.getcwd():
-            x = input(
-                f"""Warning: No argument for --input_directory.
-                The input directory used will be {input_directory}. Do you confirm? (y or [n])"""
-            )
-            if x == 'n' or x == '':
-                print("Aborted.")
-                return None
-
-        if output_directory == os.path.join(os.getcwd(), 'output'):
-            x = input(
-                f"""Warning: No argument for --output_directory.
-                The input directory used will be {output_directory}. Do you confirm? (y or [n])"""
-            )
-            if x == 'n' or x == '':
-                print("Aborted.")
-                return None
-
-        # run the script
+        return 0
+
+    # run the script
+    try:
         extract_and_filter_zips(
             input_directory=input_directory, output_directory=output_directory,
             to_remove=remove
         )
+    except ValueError as err:
+        print(err)
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
@@ -177,27 +263,35 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Pass arguments from the CLI.")
     parser.add_argument(
-        "--input_directory", type=str, nargs='?', default=os.getcwd(), const=os.getcwd(),
-        help="Input directory containing the archive(s)."
+        "--input_directory", type=str,
+        help="Input directory containing the archive(s). Required unless --run_test is given."
     )
     parser.add_argument(
-        "--output_directory", type=str, nargs='?', default=os.path.join(os.getcwd(), 'output'),
-        const=os.path.join(os.getcwd(), 'output'),
-        help="Output directory where to extract the files."
+        "--output_directory", type=str,
+        help="Output directory where to extract the files. Required unless --run_test is given."
     )
     parser.add_argument(
         "--run_test", action=argparse.BooleanOptionalAction, default=False,
         help="Run test() function. Default is False."
     )
+    parser.add_argument(
+        "-y", "--yes", action="store_true",
+        help="Accepted for compatibility with batch drivers; the script no longer prompts."
+    )
     parser.add_argument(
         "--remove", nargs='*', default=[],
         help="Subfolders to remove after decompression."
     )
     args = parser.parse_args()
 
-    print(args.run_test)
+    # fail fast instead of prompting so the script can run without a tty
+    if not args.run_test and (args.input_directory is None or args.output_directory is None):
+        parser.error(
+            "--input_directory and --output_directory are required unless --run_test is given."
+        )
+
     # run
-    main(
+    sys.exit(main(
         input_directory=args.input_directory, output_directory=args.output_directory,
         run_test=args.run_test, remove=args.remove
-    )
+    ))
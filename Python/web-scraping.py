@@ -5,20 +5,18 @@ extracting a list of members' email addresses.
 
 import argparse
 from getpass import getpass
-from cryptography.fernet import Fernet
 import os
 
-# Generate a key for encryption
-key = Fernet.generate_key()
-cipher = Fernet(key)
-
-# Securely get the email and password
+# Securely get the email and password; the password stays in a local and
+# is never echoed, so there is no need for an in-process encrypt/decrypt
+# roundtrip (transport encryption is the HTTP client's job)
 email_address = input("Enter the email address: ")
-pwd = cipher.encrypt(getpass("Enter your password: ").encode())
+pwd = getpass("Enter your password: ")
 
 print("\nLogging in...")
 
 # example
 print(f"Email: {email_address}")
-print(f"PWD_encrypted: {pwd}")
-print(f"PWD_decrypted: {cipher.decrypt(pwd).decode()}")
+
+# drop the plaintext as soon as it is no longer needed
+del pwd